@@ -9,6 +9,7 @@ import gc
 from database.db_manager import DatabaseManager
 from data_processing.data_loader import DataLoader
 from data_processing.data_processor import DataProcessor
+from utils.config import get_config
 
 # Imports des composants UI
 from ui.styles import apply_custom_styles
@@ -293,6 +294,9 @@ def render_welcome_screen():
 def main():
     """Fonction principale de l'application avec gestion reset DB"""
 
+    # Configuration globale : crée les dossiers de données au premier appel du processus
+    get_config()
+
     # NOUVEAU : Vérifier le signal de reset au démarrage
     reset_signal_path = "data/.reset_signal"
     if os.path.exists(reset_signal_path):
@@ -503,9 +507,7 @@ def main():
         except Exception as e:
             st.error(f"❌ Erreur KPI principaux: {str(e)}")
 
-        # 🆕 SECTION HEBDOMADAIRE - DEBUG VERSION
-        st.write("🔍 DEBUG: Tentative d'affichage de la section hebdomadaire...")
-
+        # Section performances hebdomadaires
         try:
             st.markdown("---")
             render_weekly_performance_table(
@@ -430,9 +430,8 @@ class DataLoader:
             df_clean = self._apply_google_ads_mapping(df_clean)
         else:
             # Mapping standard pour autres types
-            column_mapping = self.column_mappings.get(file_type, {})
-            rename_dict = {old: new for old, new in column_mapping.items() if old in df_clean.columns}
-            df_clean = df_clean.rename(columns=rename_dict)
+            # rename ignore les colonnes absentes : pas de pré-filtrage nécessaire
+            df_clean = df_clean.rename(columns=self.column_mappings.get(file_type, {}))
 
         print(f"  • Colonnes après mapping: {list(df_clean.columns)}")
 
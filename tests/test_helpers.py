@@ -0,0 +1,31 @@
+"""
+Tests des formateurs de utils/helpers.py
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.helpers import (format_currency, format_currency_series, format_number, format_number_series,
+                           format_percentage, format_percentage_series)
+
+MIXED_VALUES = [1234.5, None, np.nan, 'abc', '12', Decimal('3.5'), 7, -2.25]
+
+
+@pytest.mark.parametrize('series_formatter, scalar_formatter, kwargs', [
+    (format_currency_series, format_currency, {}),
+    (format_currency_series, format_currency, {'currency': 'USD'}),
+    (format_number_series, format_number, {}),
+    (format_number_series, format_number, {'decimals': 2}),
+    (format_percentage_series, format_percentage, {}),
+])
+def test_series_formatters_match_scalar(series_formatter, scalar_formatter, kwargs):
+    values = pd.Series(MIXED_VALUES, dtype=object)
+
+    result = series_formatter(values, **kwargs)
+
+    assert list(result) == [scalar_formatter(value, **kwargs) for value in MIXED_VALUES]
+    # Valeur non numérique affichée telle quelle, comme le formateur scalaire
+    assert result.iloc[3].startswith('abc')
@@ -0,0 +1,36 @@
+"""
+Tests du calcul des semaines de ui/components/weekly_performance.py
+"""
+
+from datetime import date
+
+import pandas as pd
+
+from ui.components.weekly_performance import add_week_info, calculate_weekly_kpis_with_date_filter
+
+
+def test_add_week_info_same_label_in_different_years():
+    # 2024 et 2029 ont le même calendrier : même week_name pour deux lundis différents
+    df = pd.DataFrame({'date': ['2024-01-03', '2029-01-03', None]})
+
+    result = add_week_info(df)
+
+    assert list(result['week_start'].iloc[:2]) == ['2024-01-01', '2029-01-01']
+    assert list(result['week_end'].iloc[:2]) == ['2024-01-07', '2029-01-07']
+    assert result['week_name'].iloc[0] == result['week_name'].iloc[1] == 'Sem 1 (01/01 → 07/01)'
+    assert result.iloc[2][['week_start', 'week_end', 'week_name']].isna().all()
+
+
+def test_weekly_kpis_over_several_years():
+    dates = pd.date_range('2023-01-01', '2030-12-31', freq='D')
+    consolidated = pd.DataFrame({'date': dates, 'cost': 1.0, 'installs': 1, 'revenue': 2.0,
+                                 'opens': 0, 'login': 0, 'purchases': 1})
+
+    weekly = calculate_weekly_kpis_with_date_filter({'consolidated': consolidated},
+                                                    (date(2023, 1, 1), date(2030, 12, 31)))
+
+    # Une ligne par lundi, de la plus récente à la plus ancienne
+    assert len(weekly) == weekly['week_start'].nunique() == 419
+    assert weekly['week_start'].iloc[0] == '2030-12-30'
+    assert weekly['week_start'].iloc[-1] == '2022-12-26'
+    assert weekly['cost'].sum() == len(dates)
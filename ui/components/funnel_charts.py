@@ -4,6 +4,9 @@ import re
 import plotly.graph_objects as go
 from utils.helpers import format_currency, format_percentage
 
+# Affichage des diagnostics add_to_cart dans l'interface (désactivé par défaut)
+DEBUG = False
+
 
 def render_acquisition_funnel(app_data: pd.DataFrame, web_data: pd.DataFrame, processed_data=None):
     """
@@ -320,13 +323,12 @@ def _apply_filters_respecting_data_logic(processed_data, filters):
 
 
 def _calculate_totals_with_correct_logic(ad_campaigns, branch_data, filters):
-    _debug_add_to_cart_in_filters(ad_campaigns)  # ← AJOUTEZ ICI
-
     """
     Calcule les totaux en respectant la logique :
     - App : Métriques publicitaires (Coût, Impressions, Clics) + Métriques Branch (Installs, Opens, Logins, Achats, Revenus)
     - Web : Google Ads seulement
     """
+    _debug_add_to_cart_in_filters(ad_campaigns)
 
     # === CALCUL APP ===
     app_totals = pd.DataFrame()
@@ -1438,7 +1440,9 @@ def _generate_comparison_suggestions(app_data: pd.DataFrame, web_data: pd.DataFr
 
 
 def _debug_add_to_cart_in_filters(filtered_campaigns):
-    """Version avec affichage dans Streamlit"""
+    """Version avec affichage dans Streamlit (uniquement si DEBUG est activé)"""
+    if not DEBUG:
+        return
 
     if 'google_ads' in filtered_campaigns['data_source'].values:
         google_data = filtered_campaigns[filtered_campaigns['data_source'] == 'google_ads']
@@ -1,10 +1,7 @@
 import streamlit as st
 
-
-def apply_custom_styles():
-    """Applique les styles CSS personnalisés à l'application"""
-
-    st.markdown("""
+# Feuille de style construite une seule fois à l'import du module
+_CSS = """
     <style>
     /* Correction de l'espacement principal et suppression de la barre blanche */
     .main .block-container {
@@ -14,16 +11,6 @@ def apply_custom_styles():
         max-width: 100%;
     }
 
-    /* Correction de l'espacement entre sidebar et contenu principal */
-    .css-1d391kg {
-        padding-top: 1rem;
-    }
-
-    /* Suppression de l'espace blanc en haut */
-    .css-18e3th9 {
-        padding-top: 0rem;
-    }
-
     /* Cartes de métriques */
     .metric-card {
         background-color: #f0f2f6;
@@ -129,12 +116,6 @@ def apply_custom_styles():
         margin-left: 0px;
     }
 
-    /* Ajustement du contenu principal pour éliminer la barre blanche */
-    .css-1lcbmhc.e1fqkh3o0 {
-        margin-left: 0px;
-        padding-left: 1rem;
-    }
-
     /* Hide Streamlit menu et footer */
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
@@ -155,4 +136,17 @@ def apply_custom_styles():
         background: #555;
     }
     </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """
+
+
+def apply_custom_styles():
+    """
+    Applique les styles CSS personnalisés à l'application
+
+    Les couleurs et la police du thème sont définies dans .streamlit/config.toml ;
+    aucune classe .css-* générée par Streamlit (instable d'une version à l'autre) n'est ciblée.
+
+    Doit être appelée à chaque exécution du script : Streamlit retire de la page
+    les éléments qui ne sont pas ré-émis lors d'un rerun.
+    """
+    st.markdown(_CSS, unsafe_allow_html=True)
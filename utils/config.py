@@ -3,13 +3,297 @@ Configuration du dashboard Kolet
 """
 
 import os
-from dataclasses import dataclass, field
-from typing import Dict, List
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, FrozenSet, Mapping, Set, Tuple
+
+
+def _interned(mapping: Dict[str, Any]) -> Mapping[str, Any]:
+    """Mapping en lecture seule dont les clés et les valeurs texte sont internées (sys.intern)"""
+    return MappingProxyType({
+        sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+        for key, value in mapping.items()
+    })
+
+
+# Valeurs par défaut partagées, construites une seule fois à l'import (lecture seule)
+
+# Mapping des sources de données
+_DATA_SOURCE_MAPPING = MappingProxyType({
+    'google_ads': 'Google Ads',
+    'apple_search_ads': 'Apple Search Ads',
+    'branch_io': 'Branch.io',
+    'facebook_ads': 'Facebook Ads',
+    'tiktok_ads': 'TikTok Ads'
+})
+
+# MODIFIÉ : Configuration des colonnes par source avec ASA campagnes
+_COLUMN_MAPPINGS = _interned({
+    'google_ads': _interned({
+        'campaign': 'campaign_name',
+        'day': 'date',
+        'cost': 'cost',
+        'impr.': 'impressions',
+        'clicks': 'clicks',
+        'installs': 'installs',
+        'purchase': 'purchases',
+        'conv. value': 'revenue'
+    }),
+    'apple_search_ads': _interned({
+        # NOUVEAU : Support ASA avec campagnes détaillées
+        'day': 'date',
+        'campaign name': 'campaign_name',  # AJOUTÉ
+        'spend': 'cost',
+        'impressions': 'impressions',
+        'taps': 'clicks',
+        'installs (tap-through)': 'installs',
+        # Colonnes supplémentaires ASA
+        'campaign status': 'campaign_status',  # AJOUTÉ
+        'ad group name': 'ad_group_name',  # AJOUTÉ
+        'new downloads (tap-through)': 'new_downloads',  # AJOUTÉ
+        'redownloads (tap-through)': 'redownloads'  # AJOUTÉ
+    }),
+    'branch_io': _interned({
+        'campaign': 'campaign_name',
+        'day': 'date',
+        'platform': 'platform',
+        'ad partner': 'source',
+        'unified installs': 'installs',
+        'unified purchases': 'purchases',
+        'clicks': 'clicks',
+        'cost': 'cost',
+        'unified revenue': 'revenue',
+        'unified opens': 'opens',
+        'unified login': 'login'
+    })
+})
+
+# Configuration des couleurs pour les graphiques
+_COLORS = MappingProxyType({
+    'primary': '#3498db',
+    'secondary': '#2ecc71',
+    'warning': '#f39c12',
+    'danger': '#e74c3c',
+    'info': '#9b59b6',
+    'success': '#27ae60',
+    'dark': '#34495e',
+    'light': '#ecf0f1'
+})
+
+
+_COLOR_PALETTES = MappingProxyType({
+    'default': ('#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6'),
+    'funnel': ('#3498db', '#2ecc71', '#e74c3c'),
+    'performance': ('#27ae60', '#f39c12', '#e74c3c'),
+    'sources': ('#3498db', '#9b59b6', '#e67e22', '#2ecc71')
+})
+
+# MODIFIÉ : Métriques principales avec nouvelles métriques ASA
+_MAIN_METRICS = (
+    MappingProxyType({'key': 'cost', 'label': 'Coût Total', 'icon': '💰', 'format': 'currency'}),
+    MappingProxyType({'key': 'impressions', 'label': 'Impressions', 'icon': '👁️', 'format': 'number'}),
+    MappingProxyType({'key': 'clicks', 'label': 'Clics', 'icon': '🖱️', 'format': 'number'}),
+    MappingProxyType({'key': 'installs', 'label': 'Installations', 'icon': '📱', 'format': 'number'}),
+    MappingProxyType({'key': 'new_downloads', 'label': 'Nouveaux téléchargements', 'icon': '⬇️',
+                      'format': 'number'}),  # NOUVEAU
+    MappingProxyType({'key': 'redownloads', 'label': 'Retéléchargements', 'icon': '🔄',
+                      'format': 'number'}),  # NOUVEAU
+    MappingProxyType({'key': 'conversion_rate', 'label': 'Taux de conversion', 'icon': '📈',
+                      'format': 'percentage'})
+)
+
+# Configuration des graphiques
+_CHART_CONFIG = MappingProxyType({
+    'funnel': MappingProxyType({
+        'height': 400,
+        'show_values': True,
+        'connector_style': 'dot'
+    }),
+    'time_series': MappingProxyType({
+        'height': 500,
+        'show_legend': True,
+        'line_width': 2
+    }),
+    'bar_chart': MappingProxyType({
+        'height': 400,
+        'orientation': 'vertical'
+    }),
+    'pie_chart': MappingProxyType({
+        'height': 400,
+        'show_percentages': True
+    })
+})
+
+
+# Messages et textes
+_MESSAGES = MappingProxyType({
+    'welcome': "Bienvenue sur le dashboard marketing de Kolet",
+    'no_data': "Aucune donnée disponible pour la période sélectionnée",
+    'upload_success': "Fichiers chargés avec succès!",
+    'upload_error': "Erreur lors du chargement des fichiers",
+    'processing': "Traitement des données en cours...",
+    'campaign_configured': "Campagne configurée avec succès!",
+    'asa_campaigns_detected': "Campagnes ASA détectées avec succès!",  # NOUVEAU
+    'asa_classification_available': "Classification des campagnes ASA disponible"  # NOUVEAU
+})
+
+# Limite de requêtes par source
+_API_RATE_LIMITS = MappingProxyType({
+    'google_ads': 1000,
+    'apple_search_ads': 500,
+    'branch_io': 2000
+})
+
+def _thaw(value: Any) -> Any:
+    """Convertit récursivement les MappingProxyType en dict (sérialisables par pickle)"""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """Inverse de _thaw : reconstruit les mappings en lecture seule"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _restore_config(cls, values: Dict[str, Any]):
+    """Reconstruit une configuration dépicklée via son constructeur"""
+    return cls(**{name: _freeze(value) for name, value in values.items()})
+
+
+class _ReadOnlyConfig:
+    """
+    Base des configurations figées contenant des MappingProxyType
+
+    Une instance étant immuable, copy.copy et copy.deepcopy renvoient l'instance
+    elle-même ; pickle passe par des dict ordinaires, les mappings en lecture seule
+    étant reconstruits au chargement.
+    """
+
+    __slots__ = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        values = {f.name: _thaw(getattr(self, f.name)) for f in fields(self) if f.init}
+        return _restore_config, (type(self), values)
+
+
+# NOUVEAU : Configuration spécifique ASA
+@dataclass(frozen=True, slots=True)
+class ASAConfig(_ReadOnlyConfig):
+    """Configuration spécifique Apple Search Ads"""
+
+    supported_formats: Tuple[str, ...] = ('campaign', 'summary')  # Formats de fichiers ASA supportés
+    default_currency: str = 'EUR'
+    campaign_status_mapping: Mapping[str, str] = field(hash=False, default_factory=lambda: _interned({
+        'RUNNING': 'Actif',
+        'PAUSED': 'En pause',
+        'CAMPAIGN_ON_HOLD': 'En attente'
+    }))
+    metrics_mapping: Mapping[str, str] = field(hash=False, default_factory=lambda: _interned({
+        'spend': 'Coût',
+        'taps': 'Clics',
+        'impressions': 'Impressions',
+        'installs': 'Installations',
+        'new_downloads': 'Nouveaux téléchargements',
+        'redownloads': 'Retéléchargements'
+    }))
+
+
+# NOUVEAU : Configuration de validation des données
+@dataclass(frozen=True, slots=True)
+class DataValidationConfig(_ReadOnlyConfig):
+    """Règles de validation des fichiers importés"""
+
+    required_columns: Mapping[str, Tuple[str, ...]] = field(hash=False, default_factory=lambda: _interned({
+        'google_ads': ('campaign', 'day', 'cost'),
+        'apple_search_ads': ('day', 'spend'),  # Flexible pour ancien/nouveau format
+        'branch_io': ('campaign', 'day', 'unified installs')
+    }))
+    numeric_columns: Tuple[str, ...] = ('cost', 'spend', 'impressions', 'clicks', 'taps', 'installs',
+                                        'purchases', 'revenue')
+    date_formats: Tuple[str, ...] = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y')
+    max_cost_threshold: int = 10000  # Alerte si coût journalier > 10k€
+    min_date: str = '2024-01-01'  # Date minimum acceptable
+    max_future_days: int = 30  # Jours maximum dans le futur
+
+
+# NOUVEAU : Configuration des alertes
+@dataclass(frozen=True, slots=True)
+class AlertConfig(_ReadOnlyConfig):
+    """Seuils et niveaux des alertes"""
+
+    cost_spike_threshold: int = 200  # % d'augmentation pour alerte
+    performance_drop_threshold: int = 50  # % de baisse pour alerte
+    data_gap_threshold: int = 3  # Jours sans données pour alerte
+    notification_channels: Tuple[str, ...] = ('dashboard', 'log')
+    alert_levels: Mapping[str, str] = field(hash=False, default_factory=lambda: MappingProxyType({
+        'info': '#3498db',
+        'warning': '#f39c12',
+        'error': '#e74c3c',
+        'success': '#2ecc71'
+    }))
+
+
+# NOUVEAU : Configuration de cache
+@dataclass(frozen=True, slots=True)
+class CacheConfig(_ReadOnlyConfig):
+    """Paramètres du cache applicatif"""
+
+    enable_caching: bool = True
+    cache_ttl_seconds: int = 300  # 5 minutes
+    cache_max_size: int = 100  # Nombre max d'éléments en cache
+    cache_strategy: str = 'lru'  # Least Recently Used
+    cacheable_operations: FrozenSet[str] = frozenset({
+        'get_campaign_data',
+        'get_consolidated_metrics',
+        'get_source_performance'
+    })
+
+
+# NOUVEAU : Configuration de performance
+@dataclass(frozen=True, slots=True)
+class PerformanceConfig(_ReadOnlyConfig):
+    """Paramètres de traitement par lots et de parallélisme"""
 
+    batch_size: int = 1000  # Taille des lots pour traitement
+    parallel_processing: bool = True  # Traitement en parallèle
+    max_workers: int = 4  # Nombre max de workers
+    memory_limit_mb: int = 512  # Limite mémoire par processus
+    query_timeout_seconds: int = 30  # Timeout des requêtes DB
+    file_processing_timeout: int = 120  # Timeout traitement fichiers
 
-@dataclass
-class Config:
-    """Configuration principale de l'application"""
+
+# Instances par défaut partagées (figées) par toutes les configurations
+_ASA_CONFIG = ASAConfig()
+_DATA_VALIDATION = DataValidationConfig()
+_ALERT_CONFIG = AlertConfig()
+_CACHE_CONFIG = CacheConfig()
+_PERFORMANCE_CONFIG = PerformanceConfig()
+
+
+@dataclass(frozen=True, slots=True)
+class Config(_ReadOnlyConfig):
+    """
+    Configuration principale de l'application
+
+    Figée : from_env() et get_config() renvoient une instance unique partagée par
+    tous les appelants ; copy/deepcopy la renvoient telle quelle et pickle la
+    reconstruit à l'identique.
+    """
 
     # Base de données
     DATABASE_PATH: str = "data/kolet_dashboard.db"
@@ -49,230 +333,103 @@ class Config:
     MAX_BACKUPS: int = 10
 
     # Configuration des fichiers
-    SUPPORTED_FILE_TYPES: List[str] = field(default_factory=lambda: ['csv'])
+    SUPPORTED_FILE_TYPES: Tuple[str, ...] = ('csv',)
 
     # Mapping des sources de données
-    DATA_SOURCE_MAPPING: Dict[str, str] = field(default_factory=lambda: {
-        'google_ads': 'Google Ads',
-        'apple_search_ads': 'Apple Search Ads',
-        'branch_io': 'Branch.io',
-        'facebook_ads': 'Facebook Ads',
-        'tiktok_ads': 'TikTok Ads'
-    })
+    DATA_SOURCE_MAPPING: Mapping[str, str] = field(hash=False, default_factory=lambda: _DATA_SOURCE_MAPPING)
 
-    # MODIFIÉ : Configuration des colonnes par source avec ASA campagnes
-    COLUMN_MAPPINGS: Dict[str, Dict[str, str]] = field(default_factory=lambda: {
-        'google_ads': {
-            'campaign': 'campaign_name',
-            'day': 'date',
-            'cost': 'cost',
-            'impr.': 'impressions',
-            'clicks': 'clicks',
-            'installs': 'installs',
-            'purchase': 'purchases',
-            'conv. value': 'revenue'
-        },
-        'apple_search_ads': {
-            # NOUVEAU : Support ASA avec campagnes détaillées
-            'day': 'date',
-            'campaign name': 'campaign_name',  # AJOUTÉ
-            'spend': 'cost',
-            'impressions': 'impressions',
-            'taps': 'clicks',
-            'installs (tap-through)': 'installs',
-            # Colonnes supplémentaires ASA
-            'campaign status': 'campaign_status',  # AJOUTÉ
-            'ad group name': 'ad_group_name',  # AJOUTÉ
-            'new downloads (tap-through)': 'new_downloads',  # AJOUTÉ
-            'redownloads (tap-through)': 'redownloads'  # AJOUTÉ
-        },
-        'branch_io': {
-            'campaign': 'campaign_name',
-            'day': 'date',
-            'platform': 'platform',
-            'ad partner': 'source',
-            'unified installs': 'installs',
-            'unified purchases': 'purchases',
-            'clicks': 'clicks',
-            'cost': 'cost',
-            'unified revenue': 'revenue',
-            'unified opens': 'opens',
-            'unified login': 'login'
-        }
-    })
+    # Configuration des colonnes par source
+    COLUMN_MAPPINGS: Mapping[str, Mapping[str, str]] = field(hash=False, default_factory=lambda: _COLUMN_MAPPINGS)
 
     # Types de campagnes
-    CAMPAIGN_TYPES: List[str] = field(default_factory=lambda: ['branding', 'acquisition', 'retargeting'])
-    CHANNEL_TYPES: List[str] = field(default_factory=lambda: ['app', 'web'])
+    CAMPAIGN_TYPES: Tuple[str, ...] = ('branding', 'acquisition', 'retargeting')
+    CHANNEL_TYPES: Tuple[str, ...] = ('app', 'web')
 
     # Plateformes supportées
-    PLATFORMS: List[str] = field(default_factory=lambda: ['iOS', 'Android', 'Web', 'App'])
+    PLATFORMS: Tuple[str, ...] = ('iOS', 'Android', 'Web', 'App')
 
     # Configuration des couleurs pour les graphiques
-    COLORS: Dict[str, str] = field(default_factory=lambda: {
-        'primary': '#3498db',
-        'secondary': '#2ecc71',
-        'warning': '#f39c12',
-        'danger': '#e74c3c',
-        'info': '#9b59b6',
-        'success': '#27ae60',
-        'dark': '#34495e',
-        'light': '#ecf0f1'
-    })
+    COLORS: Mapping[str, str] = field(hash=False, default_factory=lambda: _COLORS)
 
-    COLOR_PALETTES: Dict[str, List[str]] = field(default_factory=lambda: {
-        'default': ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6'],
-        'funnel': ['#3498db', '#2ecc71', '#e74c3c'],
-        'performance': ['#27ae60', '#f39c12', '#e74c3c'],
-        'sources': ['#3498db', '#9b59b6', '#e67e22', '#2ecc71']
-    })
+    COLOR_PALETTES: Mapping[str, Tuple[str, ...]] = field(hash=False, default_factory=lambda: _COLOR_PALETTES)
 
     # MODIFIÉ : Métriques principales avec nouvelles métriques ASA
-    MAIN_METRICS: List[Dict[str, str]] = field(default_factory=lambda: [
-        {'key': 'cost', 'label': 'Coût Total', 'icon': '💰', 'format': 'currency'},
-        {'key': 'impressions', 'label': 'Impressions', 'icon': '👁️', 'format': 'number'},
-        {'key': 'clicks', 'label': 'Clics', 'icon': '🖱️', 'format': 'number'},
-        {'key': 'installs', 'label': 'Installations', 'icon': '📱', 'format': 'number'},
-        {'key': 'new_downloads', 'label': 'Nouveaux téléchargements', 'icon': '⬇️', 'format': 'number'},  # NOUVEAU
-        {'key': 'redownloads', 'label': 'Retéléchargements', 'icon': '🔄', 'format': 'number'},  # NOUVEAU
-        {'key': 'conversion_rate', 'label': 'Taux de conversion', 'icon': '📈', 'format': 'percentage'}
-    ])
+    MAIN_METRICS: Tuple[Mapping[str, str], ...] = field(hash=False, default_factory=lambda: _MAIN_METRICS)
 
     # Configuration des graphiques
-    CHART_CONFIG: Dict[str, Dict] = field(default_factory=lambda: {
-        'funnel': {
-            'height': 400,
-            'show_values': True,
-            'connector_style': 'dot'
-        },
-        'time_series': {
-            'height': 500,
-            'show_legend': True,
-            'line_width': 2
-        },
-        'bar_chart': {
-            'height': 400,
-            'orientation': 'vertical'
-        },
-        'pie_chart': {
-            'height': 400,
-            'show_percentages': True
-        }
-    })
+    CHART_CONFIG: Mapping[str, Mapping[str, Any]] = field(hash=False, default_factory=lambda: _CHART_CONFIG)
 
     # Messages et textes
-    MESSAGES: Dict[str, str] = field(default_factory=lambda: {
-        'welcome': "Bienvenue sur le dashboard marketing de Kolet",
-        'no_data': "Aucune donnée disponible pour la période sélectionnée",
-        'upload_success': "Fichiers chargés avec succès!",
-        'upload_error': "Erreur lors du chargement des fichiers",
-        'processing': "Traitement des données en cours...",
-        'campaign_configured': "Campagne configurée avec succès!",
-        'asa_campaigns_detected': "Campagnes ASA détectées avec succès!",  # NOUVEAU
-        'asa_classification_available': "Classification des campagnes ASA disponible"  # NOUVEAU
-    })
+    MESSAGES: Mapping[str, str] = field(hash=False, default_factory=lambda: _MESSAGES)
 
     # Configuration de l'export
-    EXPORT_FORMATS: List[str] = field(default_factory=lambda: ['CSV', 'Excel', 'PDF'])
+    EXPORT_FORMATS: Tuple[str, ...] = ('CSV', 'Excel', 'PDF')
 
     # Limite de requêtes par source
-    API_RATE_LIMITS: Dict[str, int] = field(default_factory=lambda: {
-        'google_ads': 1000,
-        'apple_search_ads': 500,
-        'branch_io': 2000
-    })
+    API_RATE_LIMITS: Mapping[str, int] = field(hash=False, default_factory=lambda: _API_RATE_LIMITS)
 
     # NOUVEAU : Configuration spécifique ASA
-    ASA_CONFIG: Dict[str, Any] = field(default_factory=lambda: {
-        'supported_formats': ['campaign', 'summary'],  # Formats de fichiers ASA supportés
-        'default_currency': 'EUR',
-        'campaign_status_mapping': {
-            'RUNNING': 'Actif',
-            'PAUSED': 'En pause',
-            'CAMPAIGN_ON_HOLD': 'En attente'
-        },
-        'metrics_mapping': {
-            'spend': 'Coût',
-            'taps': 'Clics',
-            'impressions': 'Impressions',
-            'installs': 'Installations',
-            'new_downloads': 'Nouveaux téléchargements',
-            'redownloads': 'Retéléchargements'
-        }
-    })
+    ASA_CONFIG: ASAConfig = field(default_factory=lambda: _ASA_CONFIG)
 
     # NOUVEAU : Configuration de validation des données
-    DATA_VALIDATION: Dict[str, Any] = field(default_factory=lambda: {
-        'required_columns': {
-            'google_ads': ['campaign', 'day', 'cost'],
-            'apple_search_ads': ['day', 'spend'],  # Flexible pour ancien/nouveau format
-            'branch_io': ['campaign', 'day', 'unified installs']
-        },
-        'numeric_columns': ['cost', 'spend', 'impressions', 'clicks', 'taps', 'installs', 'purchases', 'revenue'],
-        'date_formats': ['%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y'],
-        'max_cost_threshold': 10000,  # Alerte si coût journalier > 10k€
-        'min_date': '2024-01-01',  # Date minimum acceptable
-        'max_future_days': 30  # Jours maximum dans le futur
-    })
+    DATA_VALIDATION: DataValidationConfig = field(default_factory=lambda: _DATA_VALIDATION)
 
     # NOUVEAU : Configuration des alertes
-    ALERT_CONFIG: Dict[str, Any] = field(default_factory=lambda: {
-        'cost_spike_threshold': 200,  # % d'augmentation pour alerte
-        'performance_drop_threshold': 50,  # % de baisse pour alerte
-        'data_gap_threshold': 3,  # Jours sans données pour alerte
-        'notification_channels': ['dashboard', 'log'],
-        'alert_levels': {
-            'info': '#3498db',
-            'warning': '#f39c12',
-            'error': '#e74c3c',
-            'success': '#2ecc71'
-        }
-    })
+    ALERT_CONFIG: AlertConfig = field(default_factory=lambda: _ALERT_CONFIG)
 
     # NOUVEAU : Configuration de cache
-    CACHE_CONFIG: Dict[str, Any] = field(default_factory=lambda: {
-        'enable_caching': True,
-        'cache_ttl_seconds': 300,  # 5 minutes
-        'cache_max_size': 100,  # Nombre max d'éléments en cache
-        'cache_strategy': 'lru',  # Least Recently Used
-        'cacheable_operations': [
-            'get_campaign_data',
-            'get_consolidated_metrics',
-            'get_source_performance'
-        ]
-    })
+    CACHE_CONFIG: CacheConfig = field(default_factory=lambda: _CACHE_CONFIG)
 
     # NOUVEAU : Configuration de performance
-    PERFORMANCE_CONFIG: Dict[str, Any] = field(default_factory=lambda: {
-        'batch_size': 1000,  # Taille des lots pour traitement
-        'parallel_processing': True,  # Traitement en parallèle
-        'max_workers': 4,  # Nombre max de workers
-        'memory_limit_mb': 512,  # Limite mémoire par processus
-        'query_timeout_seconds': 30,  # Timeout des requêtes DB
-        'file_processing_timeout': 120  # Timeout traitement fichiers
-    })
+    PERFORMANCE_CONFIG: PerformanceConfig = field(default_factory=lambda: _PERFORMANCE_CONFIG)
+
+    # Index de recherche dérivés, construits une fois dans __post_init__
+    _metric_label_index: Dict[str, str] = field(init=False, repr=False, compare=False)
+    _campaign_type_set: frozenset = field(init=False, repr=False, compare=False)
+    _channel_type_set: frozenset = field(init=False, repr=False, compare=False)
+
+    # Dossiers déjà créés ou vérifiés dans ce processus (partagé par toutes les instances)
+    _DIRS_VERIFIED: ClassVar[Set[str]] = set()
 
     def __post_init__(self):
-        """Initialisation post-création"""
-        # Créer les dossiers si nécessaire
-        os.makedirs(self.DATA_DIR, exist_ok=True)
-        os.makedirs(self.UPLOAD_DIR, exist_ok=True)
-        os.makedirs(self.BACKUP_DIR, exist_ok=True)
+        """Construit les index de libellés et de types (instance figée : object.__setattr__)"""
+        # Les métriques principales priment sur le mapping ASA
+        label_index = dict(self.ASA_CONFIG.metrics_mapping)
+        label_index.update({metric['key']: metric['label'] for metric in self.MAIN_METRICS})
+        object.__setattr__(self, '_metric_label_index', label_index)
+        object.__setattr__(self, '_campaign_type_set', frozenset(self.CAMPAIGN_TYPES))
+        object.__setattr__(self, '_channel_type_set', frozenset(self.CHANNEL_TYPES))
+
+    def ensure_dirs(self):
+        """
+        Crée les dossiers de données, d'upload, de sauvegarde et de la base si nécessaire
 
-        # Créer le dossier pour la base de données
+        Chaque dossier n'est vérifié qu'une fois par processus, même si plusieurs
+        configurations (ou un rechargement) le demandent.
+        """
         db_dir = os.path.dirname(self.DATABASE_PATH)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        for directory in (self.DATA_DIR, self.UPLOAD_DIR, self.BACKUP_DIR, db_dir):
+            if directory and directory not in Config._DIRS_VERIFIED:
+                os.makedirs(directory, exist_ok=True)
+                Config._DIRS_VERIFIED.add(directory)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def from_env(cls):
-        """Crée la configuration à partir des variables d'environnement"""
+        """
+        Crée la configuration à partir des variables d'environnement
+
+        Mémoïsée : l'environnement n'est lu qu'une fois par processus, les appels suivants
+        renvoient la même instance (figée, donc partageable).
+        """
+        # Avec slots=True, les valeurs par défaut ne sont plus des attributs de classe
+        defaults = {name: f.default for name, f in cls.__dataclass_fields__.items()}
         return cls(
-            DATABASE_PATH=os.getenv('KOLET_DB_PATH', cls.DATABASE_PATH),
-            DATA_DIR=os.getenv('KOLET_DATA_DIR', cls.DATA_DIR),
-            DEFAULT_CURRENCY=os.getenv('KOLET_CURRENCY', cls.DEFAULT_CURRENCY),
-            MAX_FILE_SIZE_MB=int(os.getenv('KOLET_MAX_FILE_SIZE', cls.MAX_FILE_SIZE_MB)),
-            DATA_RETENTION_DAYS=int(os.getenv('KOLET_RETENTION_DAYS', cls.DATA_RETENTION_DAYS))
+            DATABASE_PATH=os.getenv('KOLET_DB_PATH', defaults['DATABASE_PATH']),
+            DATA_DIR=os.getenv('KOLET_DATA_DIR', defaults['DATA_DIR']),
+            DEFAULT_CURRENCY=os.getenv('KOLET_CURRENCY', defaults['DEFAULT_CURRENCY']),
+            MAX_FILE_SIZE_MB=int(os.getenv('KOLET_MAX_FILE_SIZE', defaults['MAX_FILE_SIZE_MB'])),
+            DATA_RETENTION_DAYS=int(os.getenv('KOLET_RETENTION_DAYS', defaults['DATA_RETENTION_DAYS']))
         )
 
     def get_column_mapping(self, source_type: str) -> Dict[str, str]:
@@ -287,7 +444,7 @@ class Config:
         """
         return self.COLUMN_MAPPINGS.get(source_type, {})
 
-    def get_required_columns(self, source_type: str) -> List[str]:
+    def get_required_columns(self, source_type: str) -> Tuple[str, ...]:
         """
         Récupère les colonnes requises pour une source
 
@@ -295,9 +452,9 @@ class Config:
             source_type: Type de source
 
         Returns:
-            Liste des colonnes requises
+            Tuple des colonnes requises
         """
-        return self.DATA_VALIDATION['required_columns'].get(source_type, [])
+        return self.DATA_VALIDATION.required_columns.get(source_type, ())
 
     def get_asa_status_label(self, status_code: str) -> str:
         """
@@ -309,7 +466,7 @@ class Config:
         Returns:
             Libellé en français
         """
-        return self.ASA_CONFIG['campaign_status_mapping'].get(status_code, status_code)
+        return self.ASA_CONFIG.campaign_status_mapping.get(status_code, status_code)
 
     def get_metric_label(self, metric_key: str) -> str:
         """
@@ -321,15 +478,10 @@ class Config:
         Returns:
             Libellé de la métrique
         """
-        # Chercher dans les métriques principales
-        for metric in self.MAIN_METRICS:
-            if metric['key'] == metric_key:
-                return metric['label']
+        # Métriques principales puis mapping ASA, fusionnés dans un seul index
+        return self._metric_label_index.get(metric_key, metric_key.title())
 
-        # Chercher dans le mapping ASA
-        return self.ASA_CONFIG['metrics_mapping'].get(metric_key, metric_key.title())
-
-    def get_color_palette(self, palette_name: str = 'default') -> List[str]:
+    def get_color_palette(self, palette_name: str = 'default') -> Tuple[str, ...]:
         """
         Récupère une palette de couleurs
 
@@ -337,7 +489,7 @@ class Config:
             palette_name: Nom de la palette
 
         Returns:
-            Liste des couleurs
+            Tuple des couleurs
         """
         return self.COLOR_PALETTES.get(palette_name, self.COLOR_PALETTES['default'])
 
@@ -351,7 +503,7 @@ class Config:
         Returns:
             True si valide
         """
-        return campaign_type in self.CAMPAIGN_TYPES
+        return campaign_type in self._campaign_type_set
 
     def is_valid_channel_type(self, channel_type: str) -> bool:
         """
@@ -363,7 +515,7 @@ class Config:
         Returns:
             True si valide
         """
-        return channel_type in self.CHANNEL_TYPES
+        return channel_type in self._channel_type_set
 
     def get_alert_color(self, level: str) -> str:
         """
@@ -375,7 +527,7 @@ class Config:
         Returns:
             Code couleur hexadécimal
         """
-        return self.ALERT_CONFIG['alert_levels'].get(level, self.COLORS['info'])
+        return self.ALERT_CONFIG.alert_levels.get(level, self.COLORS['info'])
 
     def should_cache_operation(self, operation_name: str) -> bool:
         """
@@ -387,8 +539,8 @@ class Config:
         Returns:
             True si l'opération doit être cachée
         """
-        return (self.CACHE_CONFIG['enable_caching'] and
-                operation_name in self.CACHE_CONFIG['cacheable_operations'])
+        return (self.CACHE_CONFIG.enable_caching and
+                operation_name in self.CACHE_CONFIG.cacheable_operations)
 
     def validate_file_size(self, file_size_mb: float) -> bool:
         """
@@ -409,8 +561,16 @@ class Config:
         Returns:
             Taille de lot
         """
-        return self.PERFORMANCE_CONFIG['batch_size']
+        return self.PERFORMANCE_CONFIG.batch_size
+
 
+def get_config() -> Config:
+    """
+    Retourne l'instance globale de configuration, construite au premier appel
 
-# Instance globale de configuration
-config = Config.from_env()
\ No newline at end of file
+    L'instance est mémoïsée par Config.from_env ; les dossiers ne sont créés
+    qu'une seule fois par processus (garde de ensure_dirs).
+    """
+    config = Config.from_env()
+    config.ensure_dirs()
+    return config
\ No newline at end of file
@@ -5,18 +5,23 @@ Fonctions utilitaires pour le dashboard Kolet
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from itertools import cycle, islice
+from typing import Any, Dict, List, Optional, Tuple, Union
+import importlib.util
+import math
 import re
-import locale
+from numbers import Number
 
-# Configuration locale pour le formatage
-try:
-    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
-except:
-    try:
-        locale.setlocale(locale.LC_ALL, 'French_France.1252')
-    except:
-        pass  # Utiliser les paramètres par défaut
+# Séparateurs français en une seule passe : milliers ',' → ' ', décimales '.' → ','
+_FR_TRANS = str.maketrans({',': ' ', '.': ','})
+
+# Types numériques acceptés par les formateurs scalaires (les autres valeurs sont affichées telles quelles).
+# numbers.Number couvre int, float, Decimal et les scalaires NumPy, sauf np.bool_ ajouté explicitement
+_NUMBER_TYPES = (Number, np.bool_)
+
+# Symboles monétaires, séparateurs et guillemets retirés avant conversion
+_CURRENCY_RE = re.compile(r'[€$£¥,\s"]')
 
 
 def format_currency(amount: Union[float, int], currency: str = "EUR") -> str:
@@ -33,16 +38,17 @@ def format_currency(amount: Union[float, int], currency: str = "EUR") -> str:
     if pd.isna(amount) or amount is None:
         return "0,00 €"
 
-    try:
-        if currency == "EUR":
-            return f"{amount:,.2f} €".replace(",", " ").replace(".", ",")
-        elif currency == "USD":
-            return f"${amount:,.2f}"
-        else:
-            return f"{amount:,.2f} {currency}"
-    except:
+    # Valeur non numérique : affichée telle quelle
+    if not isinstance(amount, _NUMBER_TYPES):
         return f"{amount} {currency}"
 
+    if currency == "EUR":
+        return f"{amount:,.2f} €".translate(_FR_TRANS)
+    elif currency == "USD":
+        return f"${amount:,.2f}"
+    else:
+        return f"{amount:,.2f} {currency}"
+
 
 def format_number(number: Union[float, int], decimals: int = 0) -> str:
     """
@@ -58,14 +64,18 @@ def format_number(number: Union[float, int], decimals: int = 0) -> str:
     if pd.isna(number) or number is None:
         return "0"
 
-    try:
-        if decimals == 0:
-            return f"{int(number):,}".replace(",", " ")
-        else:
-            return f"{number:,.{decimals}f}".replace(",", " ").replace(".", ",")
-    except:
+    if not isinstance(number, _NUMBER_TYPES):
         return str(number)
 
+    # Sans décimales : complexe ou infini non convertible en int, affiché tel quel
+    if decimals == 0 and (isinstance(number, complex) or math.isinf(number)):
+        return str(number)
+
+    if decimals == 0:
+        return f"{int(number):,}".replace(",", " ")
+    else:
+        return f"{number:,.{decimals}f}".translate(_FR_TRANS)
+
 
 def format_percentage(percentage: Union[float, int], decimals: int = 2) -> str:
     """
@@ -81,12 +91,94 @@ def format_percentage(percentage: Union[float, int], decimals: int = 2) -> str:
     if pd.isna(percentage) or percentage is None:
         return "0,00%"
 
-    try:
-        formatted = f"{percentage:.{decimals}f}%".replace(".", ",")
-        return formatted
-    except:
+    # Valeur non numérique : affichée telle quelle
+    if not isinstance(percentage, _NUMBER_TYPES):
         return f"{percentage}%"
 
+    return f"{percentage:.{decimals}f}%".replace(".", ",")
+
+
+def _to_float_array(values: pd.Series) -> np.ndarray:
+    """Convertit une colonne en tableau float64 (valeurs manquantes ou invalides → NaN)"""
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _keep_non_numeric(out: np.ndarray, values: pd.Series, scalar_formatter) -> np.ndarray:
+    """Valeurs non numériques d'une colonne non numérique : rendu du formateur scalaire (tel quel)"""
+    if pd.api.types.is_numeric_dtype(values):
+        return out
+
+    for pos, value in enumerate(values):
+        if not isinstance(value, _NUMBER_TYPES) and not pd.isna(value):
+            out[pos] = scalar_formatter(value)
+    return out
+
+
+def format_currency_series(values: pd.Series, currency: str = "EUR") -> pd.Series:
+    """
+    Formate une colonne entière de montants (même rendu que format_currency)
+
+    Args:
+        values: Série de montants
+        currency: Code de la devise
+
+    Returns:
+        Série de montants formatés, même index que l'entrée
+    """
+    vals = _to_float_array(values)
+    if currency == "EUR":
+        formatted = [f"{v:,.2f} €".translate(_FR_TRANS) for v in vals]
+    elif currency == "USD":
+        formatted = [f"${v:,.2f}" for v in vals]
+    else:
+        formatted = [f"{v:,.2f} {currency}" for v in vals]
+
+    out = np.array(formatted, dtype=object)
+    out[np.isnan(vals)] = "0,00 €"
+    out = _keep_non_numeric(out, values, lambda value: format_currency(value, currency))
+    return pd.Series(out, index=values.index)
+
+
+def format_number_series(values: pd.Series, decimals: int = 0) -> pd.Series:
+    """
+    Formate une colonne entière de nombres (même rendu que format_number)
+
+    Args:
+        values: Série de nombres
+        decimals: Nombre de décimales
+
+    Returns:
+        Série de nombres formatés, même index que l'entrée
+    """
+    vals = _to_float_array(values)
+    if decimals == 0:
+        formatted = [f"{int(v):,}".replace(",", " ") if np.isfinite(v) else str(v) for v in vals]
+    else:
+        formatted = [f"{v:,.{decimals}f}".translate(_FR_TRANS) for v in vals]
+
+    out = np.array(formatted, dtype=object)
+    out[np.isnan(vals)] = "0"
+    out = _keep_non_numeric(out, values, lambda value: format_number(value, decimals))
+    return pd.Series(out, index=values.index)
+
+
+def format_percentage_series(values: pd.Series, decimals: int = 2) -> pd.Series:
+    """
+    Formate une colonne entière de pourcentages (même rendu que format_percentage)
+
+    Args:
+        values: Série de pourcentages
+        decimals: Nombre de décimales
+
+    Returns:
+        Série de pourcentages formatés, même index que l'entrée
+    """
+    vals = _to_float_array(values)
+    out = np.array([f"{v:.{decimals}f}%".translate(_FR_TRANS) for v in vals], dtype=object)
+    out[np.isnan(vals)] = "0,00%"
+    out = _keep_non_numeric(out, values, lambda value: format_percentage(value, decimals))
+    return pd.Series(out, index=values.index)
+
 
 def format_delta(current: float, previous: float, format_type: str = "percentage") -> Dict[str, Any]:
     """
@@ -139,6 +231,51 @@ def format_delta(current: float, previous: float, format_type: str = "percentage
     }
 
 
+def format_delta_frame(current: pd.Series, previous: pd.Series,
+                       format_type: str = "percentage") -> pd.DataFrame:
+    """
+    Calcule et formate les variations de plusieurs métriques en une passe (mêmes règles que format_delta)
+
+    Args:
+        current: Valeurs actuelles
+        previous: Valeurs précédentes (même index que current)
+        format_type: Type de formatage ('percentage', 'absolute', 'currency')
+
+    Returns:
+        DataFrame indexé comme current avec delta, delta_pct, delta_formatted, color et arrow
+    """
+    cur = _to_float_array(current)
+    prev = _to_float_array(previous)
+
+    # Valeur manquante ou référence nulle : variation neutre, comme format_delta
+    invalid = np.isnan(cur) | np.isnan(prev) | (prev == 0)
+    delta = np.where(invalid, 0.0, cur - prev)
+    delta_pct = np.divide(delta, prev, out=np.zeros_like(delta), where=~invalid) * 100
+
+    # delta NaN (ex. inf - inf) : ni hausse ni baisse, comme format_delta
+    sign = np.sign(np.where(np.isnan(delta), 0.0, delta)).astype(int) + 1
+    color = np.array(["inverse", "off", "normal"], dtype=object)[sign]
+    arrow = np.array(["🔻", "➖", "🔺"], dtype=object)[sign]
+    color[invalid] = "normal"
+    arrow[invalid] = ""
+
+    if format_type == "percentage":
+        delta_formatted = format_percentage_series(pd.Series(delta_pct)).to_numpy()
+    elif format_type == "currency":
+        delta_formatted = format_currency_series(pd.Series(delta)).to_numpy()
+    else:
+        delta_formatted = format_number_series(pd.Series(delta)).to_numpy()
+    delta_formatted[invalid] = "0"
+
+    return pd.DataFrame({
+        'delta': delta,
+        'delta_pct': delta_pct,
+        'delta_formatted': delta_formatted,
+        'color': color,
+        'arrow': arrow
+    }, index=current.index)
+
+
 def calculate_funnel_metrics(impressions: int, clicks: int, installs: int,
                              purchases: int = 0) -> Dict[str, float]:
     """
@@ -175,6 +312,20 @@ def calculate_funnel_metrics(impressions: int, clicks: int, installs: int,
     return metrics
 
 
+# Formats de date reconnus, dans l'ordre de priorité
+_DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%m-%d-%Y',
+    '%Y.%m.%d',
+    '%d.%m.%Y'
+)
+
+
+@lru_cache(maxsize=1024)
 def detect_date_format(date_string: str) -> str:
     """
     Détecte le format d'une date
@@ -185,18 +336,7 @@ def detect_date_format(date_string: str) -> str:
     Returns:
         Format de date détecté
     """
-    date_formats = [
-        '%Y-%m-%d',
-        '%d/%m/%Y',
-        '%m/%d/%Y',
-        '%Y/%m/%d',
-        '%d-%m-%Y',
-        '%m-%d-%Y',
-        '%Y.%m.%d',
-        '%d.%m.%Y'
-    ]
-
-    for fmt in date_formats:
+    for fmt in _DATE_FORMATS:
         try:
             datetime.strptime(date_string, fmt)
             return fmt
@@ -206,6 +346,20 @@ def detect_date_format(date_string: str) -> str:
     return '%Y-%m-%d'  # Format par défaut
 
 
+def detect_date_format_column(dates: pd.Series) -> str:
+    """
+    Détecte le format d'une colonne de dates à partir de sa première valeur renseignée
+
+    Args:
+        dates: Série de dates (chaînes)
+
+    Returns:
+        Format de date détecté
+    """
+    non_null = dates.dropna()
+    return detect_date_format(str(non_null.iloc[0]) if not non_null.empty else '')
+
+
 def clean_currency_string(currency_str: Union[str, float, int]) -> float:
     """
     Nettoie une chaîne de devise et la convertit en float
@@ -223,7 +377,7 @@ def clean_currency_string(currency_str: Union[str, float, int]) -> float:
         return float(currency_str)
 
     # Nettoyer la chaîne
-    cleaned = re.sub(r'[€$£¥,\s"]', '', str(currency_str))
+    cleaned = _CURRENCY_RE.sub('', str(currency_str))
     cleaned = cleaned.replace(',', '.')
 
     try:
@@ -232,6 +386,23 @@ def clean_currency_string(currency_str: Union[str, float, int]) -> float:
         return 0.0
 
 
+def clean_currency_series(values: pd.Series) -> pd.Series:
+    """
+    Nettoie une colonne entière de montants (même règle que clean_currency_string)
+
+    Args:
+        values: Série de chaînes ou de nombres
+
+    Returns:
+        Série float64, 0.0 pour les valeurs manquantes ou illisibles
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64').fillna(0.0)
+
+    cleaned = values.astype(str).str.replace(_CURRENCY_RE, '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+
+
 def generate_date_range(start_date: str, end_date: str) -> List[str]:
     """
     Génère une liste de dates entre deux dates
@@ -243,17 +414,14 @@ def generate_date_range(start_date: str, end_date: str) -> List[str]:
     Returns:
         Liste des dates
     """
-    start = datetime.strptime(start_date, '%Y-%m-%d')
-    end = datetime.strptime(end_date, '%Y-%m-%d')
-
-    date_list = []
-    current = start
+    # Copie de la version en cache : l'appelant peut modifier la liste sans effet de bord
+    return list(_date_range_cached(start_date, end_date))
 
-    while current <= end:
-        date_list.append(current.strftime('%Y-%m-%d'))
-        current += timedelta(days=1)
 
-    return date_list
+@lru_cache(maxsize=256)
+def _date_range_cached(start_date: str, end_date: str) -> Tuple[str, ...]:
+    """Dates quotidiennes entre deux bornes incluses, calculées une fois par couple de bornes"""
+    return tuple(pd.date_range(start=start_date, end=end_date, freq='D').strftime('%Y-%m-%d'))
 
 
 def get_period_comparison_dates(period: str = "last_30_days") -> Dict[str, str]:
@@ -292,12 +460,10 @@ def get_period_comparison_dates(period: str = "last_30_days") -> Dict[str, str]:
         previous_end = current_start - timedelta(days=1)
         previous_start = previous_end - timedelta(days=29)
 
-    return {
-        'current_start': current_start.strftime('%Y-%m-%d'),
-        'current_end': current_end.strftime('%Y-%m-%d'),
-        'previous_start': previous_start.strftime('%Y-%m-%d'),
-        'previous_end': previous_end.strftime('%Y-%m-%d')
-    }
+    # Les quatre bornes formatées en un seul appel
+    keys = ('current_start', 'current_end', 'previous_start', 'previous_end')
+    bounds = pd.DatetimeIndex([current_start, current_end, previous_start, previous_end])
+    return dict(zip(keys, bounds.strftime('%Y-%m-%d')))
 
 
 def calculate_growth_rate(current: float, previous: float) -> float:
@@ -317,6 +483,18 @@ def calculate_growth_rate(current: float, previous: float) -> float:
     return ((current - previous) / previous) * 100
 
 
+# Seuils de performance par métrique (triés) et libellés de chaque intervalle.
+# side='left' : seuil inclus dans la catégorie basse (plus bas = meilleur, ex. CPA) ;
+# side='right' : seuil inclus dans la catégorie haute (plus haut = meilleur).
+_PERFORMANCE_THRESHOLDS = {
+    'cpa': (np.array([5, 15, 30]), np.array(['Excellent', 'Bon', 'Moyen', 'Faible'], dtype=object), 'left'),
+    'roas': (np.array([1, 2, 3]), np.array(['Faible', 'Moyen', 'Bon', 'Excellent'], dtype=object), 'right'),
+    'ctr': (np.array([0.5, 1.5, 3]), np.array(['Faible', 'Moyen', 'Bon', 'Excellent'], dtype=object), 'right'),
+    'conversion_rate': (np.array([2, 5, 10]), np.array(['Faible', 'Moyen', 'Bon', 'Excellent'], dtype=object),
+                        'right')
+}
+
+
 def categorize_performance(value: float, metric: str) -> str:
     """
     Catégorise la performance d'une métrique
@@ -328,47 +506,39 @@ def categorize_performance(value: float, metric: str) -> str:
     Returns:
         Catégorie de performance
     """
-    if metric == "cpa":
-        if value <= 5:
-            return "Excellent"
-        elif value <= 15:
-            return "Bon"
-        elif value <= 30:
-            return "Moyen"
-        else:
-            return "Faible"
-
-    elif metric == "roas":
-        if value >= 3:
-            return "Excellent"
-        elif value >= 2:
-            return "Bon"
-        elif value >= 1:
-            return "Moyen"
-        else:
-            return "Faible"
-
-    elif metric == "ctr":
-        if value >= 3:
-            return "Excellent"
-        elif value >= 1.5:
-            return "Bon"
-        elif value >= 0.5:
-            return "Moyen"
-        else:
-            return "Faible"
-
-    elif metric == "conversion_rate":
-        if value >= 10:
-            return "Excellent"
-        elif value >= 5:
-            return "Bon"
-        elif value >= 2:
-            return "Moyen"
-        else:
-            return "Faible"
-
-    return "Non défini"
+    if metric not in _PERFORMANCE_THRESHOLDS:
+        return "Non défini"
+
+    value = np.nan if value is None else float(value)
+    # Une valeur manquante ne satisfait aucun seuil : catégorie la plus basse
+    if np.isnan(value):
+        return 'Faible'
+
+    thresholds, labels, side = _PERFORMANCE_THRESHOLDS[metric]
+    return labels[np.searchsorted(thresholds, value, side=side)]
+
+
+def categorize_performance_series(values: pd.Series, metric: str) -> pd.Series:
+    """
+    Catégorise une colonne entière de valeurs (même règles que categorize_performance)
+
+    Args:
+        values: Série de valeurs de la métrique
+        metric: Type de métrique
+
+    Returns:
+        Série de catégories, même index que l'entrée
+    """
+    if metric not in _PERFORMANCE_THRESHOLDS:
+        return pd.Series("Non défini", index=values.index, dtype=object)
+
+    thresholds, labels, side = _PERFORMANCE_THRESHOLDS[metric]
+    vals = _to_float_array(values)
+
+    categories = labels[np.searchsorted(thresholds, vals, side=side)]
+    # Une valeur manquante ne satisfait aucun seuil : catégorie la plus basse
+    categories[np.isnan(vals)] = 'Faible'
+    return pd.Series(categories, index=values.index)
 
 
 def validate_file_upload(file, max_size_mb: int = 50) -> Dict[str, Any]:
@@ -393,8 +563,9 @@ def validate_file_upload(file, max_size_mb: int = 50) -> Dict[str, Any]:
         result['errors'].append("Aucun fichier sélectionné")
         return result
 
-    # Vérifier l'extension
-    if not file.name.lower().endswith('.csv'):
+    # Vérifier l'extension (seule l'extension est mise en minuscules, pas le nom complet)
+    _, dot, extension = file.name.rpartition('.')
+    if not dot or extension.lower() != 'csv':
         result['valid'] = False
         result['errors'].append("Le fichier doit être au format CSV")
 
@@ -420,22 +591,16 @@ def create_summary_stats(df: pd.DataFrame) -> Dict[str, Any]:
     if df.empty:
         return {}
 
-    numeric_columns = df.select_dtypes(include=[np.number]).columns
-    stats = {}
+    numeric = df.select_dtypes(include=[np.number])
+    if numeric.empty:
+        return {}
 
-    for col in numeric_columns:
-        if col in df.columns:
-            stats[col] = {
-                'total': df[col].sum(),
-                'mean': df[col].mean(),
-                'median': df[col].median(),
-                'std': df[col].std(),
-                'min': df[col].min(),
-                'max': df[col].max(),
-                'count': df[col].count()
-            }
+    # Toutes les statistiques en un seul appel ; 'sum' est exposé sous la clé 'total'
+    summary = numeric.agg(['sum', 'mean', 'median', 'std', 'min', 'max', 'count'])
+    summary = summary.rename(index={'sum': 'total'})
 
-    return stats
+    # agg renvoie un tableau float : le comptage redevient entier
+    return {col: {**values.to_dict(), 'count': int(values['count'])} for col, values in summary.items()}
 
 
 def export_to_excel(dataframes: Dict[str, pd.DataFrame], filename: str = None) -> str:
@@ -453,13 +618,26 @@ def export_to_excel(dataframes: Dict[str, pd.DataFrame], filename: str = None) -
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"kolet_export_{timestamp}.xlsx"
 
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+    # xlsxwriter écrit en flux (plus rapide, moins de mémoire) ; openpyxl en repli s'il est absent.
+    # Pas de constant_memory : pandas écrit colonne par colonne, ce mode perdrait des cellules.
+    engine = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else 'openpyxl'
+
+    with pd.ExcelWriter(filename, engine=engine) as writer:
         for sheet_name, df in dataframes.items():
             df.to_excel(writer, sheet_name=sheet_name, index=False)
 
     return filename
 
 
+# Palettes de base, répétées cycliquement par generate_color_palette
+_PALETTES = {
+    'default': ('#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6', '#1abc9c', '#34495e'),
+    'blue': ('#3498db', '#5dade2', '#85c1e9', '#aed6f1', '#d6eaf8'),
+    'green': ('#2ecc71', '#58d68d', '#82e0aa', '#abebc6', '#d5f4e6'),
+    'warm': ('#e74c3c', '#f39c12', '#f7dc6f', '#f8c471', '#f5b7b1')
+}
+
+
 def generate_color_palette(n_colors: int, palette_type: str = "default") -> List[str]:
     """
     Génère une palette de couleurs
@@ -471,21 +649,10 @@ def generate_color_palette(n_colors: int, palette_type: str = "default") -> List
     Returns:
         Liste des couleurs en hex
     """
-    palettes = {
-        'default': ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6', '#1abc9c', '#34495e'],
-        'blue': ['#3498db', '#5dade2', '#85c1e9', '#aed6f1', '#d6eaf8'],
-        'green': ['#2ecc71', '#58d68d', '#82e0aa', '#abebc6', '#d5f4e6'],
-        'warm': ['#e74c3c', '#f39c12', '#f7dc6f', '#f8c471', '#f5b7b1']
-    }
-
-    base_colors = palettes.get(palette_type, palettes['default'])
+    base_colors = _PALETTES.get(palette_type, _PALETTES['default'])
 
     # Répéter les couleurs si nécessaire
-    colors = []
-    for i in range(n_colors):
-        colors.append(base_colors[i % len(base_colors)])
-
-    return colors
+    return list(islice(cycle(base_colors), n_colors))
 
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
@@ -500,12 +667,13 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     Returns:
         Résultat de la division ou valeur par défaut
     """
-    try:
-        if denominator == 0 or pd.isna(denominator):
-            return default
-        return numerator / denominator
-    except:
+    if not isinstance(numerator, _NUMBER_TYPES) or not isinstance(denominator, _NUMBER_TYPES):
+        return default
+
+    # denominator != denominator : test NaN sans appel à pd.isna
+    if denominator == 0 or denominator != denominator:
         return default
+    return numerator / denominator
 
 
 def truncate_text(text: str, max_length: int = 50, suffix: str = "...") -> str: